@@ -1,9 +1,19 @@
 import os
-import json
+import mmap
+import functools
+import orjson
 
+# Oltre questa dimensione il file viene mappato in memoria invece che letto
+SOGLIA_MMAP = 1024 * 1024
+
+@functools.lru_cache(maxsize=None)
 def carica_memoria(percorso):
-    with open(percorso, 'r') as f:
-        return json.load(f)
+    with open(percorso, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < SOGLIA_MMAP:
+            return orjson.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as buf:
+                return orjson.loads(buf)
 
 def main():
     modello = os.getenv("OLLAMA_MODEL", "gpt")
@@ -5,31 +5,96 @@ A production-ready Telegram bot with Ollama/OpenAI integration and Redis caching
 """
 
 import os
-import json
 import logging
+import logging.handlers
+import queue
+import time
+import random
+import hashlib
+import unicodedata
 import asyncio
 import aiohttp
+import cachetools
+import orjson
+import uvloop
+import zstandard
 import redis.asyncio as redis
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from typing import Optional, Dict, Any, Tuple, AsyncIterator, List
+from telegram import Message, Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
     Application, CommandHandler, MessageHandler, 
     CallbackQueryHandler, ContextTypes, filters
 )
 from telegram.constants import ParseMode
+from telegram.error import BadRequest, TelegramError
 
-# Configure logging
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO,
-    handlers=[
-        logging.FileHandler('logs/bot.log'),
-        logging.StreamHandler()
-    ]
-)
+# Configure logging: handlers only enqueue records, a background listener
+# thread (started in __main__) does the actual file/stream writes
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+log_handlers: List[logging.Handler] = [
+    logging.FileHandler('logs/bot.log'),
+    logging.StreamHandler()
+]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+
+log_queue: queue.Queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+queue_handler = logging.handlers.QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
 logger = logging.getLogger(__name__)
 
+PERSONALITY_PATH = 'data/personality.json'
+
+# Max entries in the in-process response cache
+L1_CACHE_SIZE = 1024
+
+# Seconds a cached response is kept, in process and in Redis
+CACHE_TTL = 3600
+
+# Longer prompts rarely repeat, so they are neither normalized nor cached
+MAX_CACHEABLE_LENGTH = 200
+
+# Cached responses above this many bytes are zstd-compressed; the first byte
+# of every stored value marks the encoding
+COMPRESS_MIN_BYTES = 512
+CACHE_PLAIN = b'\x00'
+CACHE_ZSTD = b'\x01'
+
+# LLM requests answered with 429 or 5xx are attempted this many times in total,
+# with jittered exponential backoff in between
+LLM_ATTEMPTS = 2
+
+# Minimum seconds between edits of a message being streamed
+STREAM_EDIT_INTERVAL = 0.5
+
+# Seconds a rendered /status reply is reused before probing services again
+STATUS_CACHE_TTL = 5.0
+
+# Sliding-window rate limit: KEYS[1] = rate limit key, optional KEYS[2] = response
+# cache key, ARGV = (now_ms, window_ms, limit, unique member) -> {allowed, count, cached}
+# The cached response is only fetched when the request is allowed.
+RATE_LIMIT_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+local count = redis.call('ZCARD', key)
+if count >= limit then
+    return {0, count}
+end
+redis.call('ZADD', key, now, ARGV[4])
+redis.call('PEXPIRE', key, window)
+local cached = false
+if KEYS[2] then
+    cached = redis.call('GET', KEYS[2])
+end
+return {1, count + 1, cached}
+"""
+
 class TaurosBot:
     def __init__(self):
         self.token = os.getenv('TELEGRAM_TOKEN')
@@ -41,20 +106,59 @@ class TaurosBot:
         
         # Initialize Redis connection
         self.redis_client = None
+        self._rl_script = None
+        
+        # zstd contexts for cached responses stored in Redis
+        self._zc = zstandard.ZstdCompressor(level=3)
+        self._zd = zstandard.ZstdDecompressor()
+        
+        # In-process cache of responses in front of Redis, expiring with the Redis entries
+        self._l1: cachetools.TTLCache = cachetools.TTLCache(maxsize=L1_CACHE_SIZE, ttl=CACHE_TTL)
+        
+        # Last rendered /status reply as (monotonic timestamp, text)
+        self._status_cache: Optional[Tuple[float, str]] = None
+        
+        # Shared HTTP session with keep-alive connection pooling
+        self.http: Optional[aiohttp.ClientSession] = None
+        
+        # Fire-and-forget tasks kept referenced until they finish
+        self._pending: set[asyncio.Task] = set()
+        
+        # Bound concurrent LLM requests so bursts don't pile onto Ollama's queue
+        self._llm_sem = asyncio.Semaphore(int(os.getenv('LLM_CONCURRENCY', '5')))
         
         # Load bot personality from config
+        self.personality: Optional[Dict[str, Any]] = None
+        self._personality_mtime: Optional[float] = None
         self.personality = self.load_personality()
+        self._sys_prompt = self.build_system_prompt()
         
         # Rate limiting settings
         self.rate_limit_window = 60  # seconds
         self.rate_limit_max_requests = 10
         
+        # In-process fixed-window counters as user_id -> (window end, count);
+        # Redis is only consulted when several bot instances share the limit
+        self.redis_distributed = os.getenv('REDIS_DISTRIBUTED', 'false').lower() == 'true'
+        self._rl: cachetools.TTLCache = cachetools.TTLCache(maxsize=100_000, ttl=self.rate_limit_window)
+        
+        # Command replies that only depend on configuration
+        self._build_static_texts()
+        
     def load_personality(self) -> Dict[str, Any]:
-        """Load bot personality configuration"""
+        """Load bot personality configuration, reparsing only when the file changed"""
         try:
-            with open('data/personality.json', 'r', encoding='utf-8') as f:
-                return json.load(f)
+            mtime = os.stat(PERSONALITY_PATH).st_mtime
+            if mtime == self._personality_mtime:
+                return self.personality
+            with open(PERSONALITY_PATH, 'rb') as f:
+                personality = orjson.loads(f.read())
+            self._personality_mtime = mtime
+            return personality
         except FileNotFoundError:
+            if self.personality is not None and self._personality_mtime is None:
+                return self.personality
+            self._personality_mtime = None
             # Default personality
             return {
                 "name": "Tauros AI",
@@ -65,58 +169,268 @@ class TaurosBot:
                 "response_style": "conversational and engaging"
             }
     
+    def reload_personality(self):
+        """Pick up changes to the personality file"""
+        try:
+            personality = self.load_personality()
+        except orjson.JSONDecodeError as e:
+            logger.error("Invalid personality file, keeping current: %s", e)
+            return
+        if personality is not self.personality:
+            self.personality = personality
+            self._sys_prompt = self.build_system_prompt()
+            self._build_static_texts()
+            logger.info("Personality reloaded: %s", self.personality['name'])
+    
+    def build_system_prompt(self) -> str:
+        """Build the system prompt from the loaded personality"""
+        return f"You are {self.personality['name']}, {self.personality['description']}. " \
+               f"Your response style is {self.personality['response_style']}."
+    
+    def _build_static_texts(self):
+        """Render the /start and /help replies once"""
+        # Escaped so only {first_name} is substituted per /start
+        name = self.personality['name'].replace('{', '{{').replace('}', '}}')
+        self._welcome_tmpl = f"""
+🤖 **Welcome to {name}!**
+
+Hello {{first_name}}! I'm an AI assistant powered by Ollama/OpenAI.
+
+**Available Commands:**
+• `/help` - Show this help message
+• `/status` - Check bot status
+• `/clear` - Clear conversation history
+• `/settings` - Bot settings
+
+Just send me a message and I'll respond with AI-generated content!
+        """
+        
+        self._start_markup = InlineKeyboardMarkup([
+            [InlineKeyboardButton("🆘 Help", callback_data='help')],
+            [InlineKeyboardButton("⚙️ Settings", callback_data='settings')],
+            [InlineKeyboardButton("📊 Status", callback_data='status')]
+        ])
+        
+        self._help_text = f"""
+🆘 **{self.personality['name']} Help**
+
+**Commands:**
+• `/start` - Start the bot and show welcome message
+• `/help` - Show this help message
+• `/status` - Check bot and services status
+• `/clear` - Clear your conversation history
+• `/settings` - Configure bot settings
+
+**Features:**
+• AI-powered responses using Ollama/OpenAI
+• Conversation memory and context
+• Rate limiting for fair usage
+• Cached responses for faster replies
+
+**Usage:**
+Simply send me any message and I'll respond with AI-generated content. I can help with:
+• Questions and answers
+• Creative writing
+• Problem solving
+• General conversation
+
+**Rate Limits:**
+You can send up to {self.rate_limit_max_requests} messages per {self.rate_limit_window} seconds.
+        """
+    
     async def setup_redis(self):
         """Initialize Redis connection"""
         try:
-            self.redis_client = redis.from_url(self.redis_url)
+            # Cached responses are binary (see encode_cached), so replies stay
+            # bytes and only those values are decoded
+            self.redis_client = redis.from_url(
+                self.redis_url,
+                decode_responses=False,
+                health_check_interval=30,
+                socket_keepalive=True
+            )
             await self.redis_client.ping()
+            # Script object runs EVALSHA and re-uploads the script on NOSCRIPT
+            # (e.g. after a Redis restart or failover)
+            self._rl_script = self.redis_client.register_script(RATE_LIMIT_SCRIPT)
             logger.info("Redis connection established")
         except Exception as e:
-            logger.error(f"Failed to connect to Redis: {e}")
+            logger.error("Failed to connect to Redis: %s", e)
             self.redis_client = None
     
+    async def setup_http(self):
+        """Initialize the shared HTTP session"""
+        self.http = aiohttp.ClientSession(
+            json_serialize=lambda obj: orjson.dumps(obj).decode(),
+            connector=aiohttp.TCPConnector(limit=64, limit_per_host=32, keepalive_timeout=75),
+            # Short connect budget so a dead backend fails over quickly
+            timeout=aiohttp.ClientTimeout(total=30, sock_connect=2, sock_read=28)
+        )
+    
+    async def _post_init(self, application: Application):
+        """Open shared connections on the loop that serves updates"""
+        await self.setup_redis()
+        await self.setup_http()
+    
+    async def _post_shutdown(self, application: Application):
+        """Close shared connections on application shutdown"""
+        # Let in-flight cache writes finish before their connection goes away
+        await asyncio.gather(*self._pending, return_exceptions=True)
+        if self.http:
+            await self.http.close()
+        if self.redis_client:
+            await self.redis_client.close()
+    
+    def spawn(self, coro) -> asyncio.Task:
+        """Schedule a fire-and-forget coroutine alongside the reply"""
+        task = asyncio.create_task(coro)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        task.add_done_callback(self._log_task_error)
+        return task
+    
+    @staticmethod
+    def _log_task_error(task: asyncio.Task):
+        """Surface exceptions from fire-and-forget tasks instead of dropping them"""
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Background task failed: %r", task.exception())
+    
+    @staticmethod
+    def cache_key(message_text: str) -> Optional[str]:
+        """Digest of the normalized prompt, or None if it is not worth caching"""
+        if len(message_text) > MAX_CACHEABLE_LENGTH:
+            return None
+        # Fold case, whitespace and Unicode variants so "Hello " and "hello"
+        # share an entry; the digest is shared across users
+        normalized = unicodedata.normalize('NFKC', message_text).strip().lower()
+        return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def encode_cached(self, response: str) -> bytes:
+        """Encode a response for Redis, compressing long ones"""
+        data = response.encode('utf-8')
+        if len(data) > COMPRESS_MIN_BYTES:
+            return CACHE_ZSTD + self._zc.compress(data)
+        return CACHE_PLAIN + data
+    
+    def decode_cached(self, blob: bytes) -> str:
+        """Decode a response stored by encode_cached"""
+        marker = blob[:1]
+        if marker == CACHE_ZSTD:
+            return self._zd.decompress(blob[1:]).decode('utf-8')
+        if marker == CACHE_PLAIN:
+            return blob[1:].decode('utf-8')
+        # Entries written before the marker byte was introduced
+        return blob.decode('utf-8')
+    
     async def get_cached_response(self, message_hash: str) -> Optional[str]:
-        """Get cached response from Redis"""
+        """Get cached response from the in-process cache, then Redis"""
+        cached = self._l1.get(message_hash)
+        if cached is not None:
+            return cached
+        
         if not self.redis_client:
             return None
         try:
-            cached = await self.redis_client.get(f"response:{message_hash}")
-            return cached.decode('utf-8') if cached else None
+            blob = await self.redis_client.get(f"resp:{message_hash}")
+            if not blob:
+                return None
+            cached = self.decode_cached(blob)
+            self._l1[message_hash] = cached
+            return cached
         except Exception as e:
-            logger.error(f"Redis get error: {e}")
+            logger.error("Redis get error: %s", e)
             return None
     
-    async def cache_response(self, message_hash: str, response: str, ttl: int = 3600):
-        """Cache response in Redis"""
+    async def cache_response(self, message_hash: str, response: str, ttl: int = CACHE_TTL):
+        """Cache response in the in-process cache and Redis"""
+        self._l1[message_hash] = response
         if not self.redis_client:
             return
         try:
-            await self.redis_client.setex(f"response:{message_hash}", ttl, response)
+            await self.redis_client.setex(f"resp:{message_hash}", ttl, self.encode_cached(response))
         except Exception as e:
-            logger.error(f"Redis set error: {e}")
+            logger.error("Redis set error: %s", e)
+    
+    async def _eval_rate_limit(self, user_id: int, message_hash: Optional[str] = None) -> list:
+        """Run the rate limit script, optionally fetching a cached response too"""
+        keys = [f"rl:{user_id}"]
+        if message_hash:
+            keys.append(f"resp:{message_hash}")
+        now_ms = int(time.time() * 1000)
+        args = (
+            now_ms,
+            self.rate_limit_window * 1000,
+            self.rate_limit_max_requests,
+            f"{now_ms}-{os.urandom(4).hex()}"
+        )
+        return await self._rl_script(keys=keys, args=args)
+    
+    def _local_rate_limit(self, user_id: int) -> bool:
+        """Count a request against the in-process window, without any I/O"""
+        now = time.monotonic()
+        window_end, count = self._rl.get(user_id, (0.0, 0))
+        if now >= window_end:
+            window_end, count = now + self.rate_limit_window, 0
+        if count >= self.rate_limit_max_requests:
+            return False
+        self._rl[user_id] = (window_end, count + 1)
+        return True
     
     async def check_rate_limit(self, user_id: int) -> bool:
         """Check if user is within rate limits"""
-        if not self.redis_client:
-            return True
+        if not (self.redis_distributed and self.redis_client):
+            return self._local_rate_limit(user_id)
         
         try:
-            key = f"rate_limit:{user_id}"
-            current_count = await self.redis_client.get(key)
-            
-            if current_count is None:
-                await self.redis_client.setex(key, self.rate_limit_window, 1)
-                return True
-            
-            count = int(current_count)
-            if count >= self.rate_limit_max_requests:
-                return False
-            
-            await self.redis_client.incr(key)
-            return True
+            result = await self._eval_rate_limit(user_id)
+            return bool(result[0])
+        except Exception as e:
+            logger.error("Rate limit check error: %s", e)
+            return self._local_rate_limit(user_id)
+    
+    async def check_rate_limit_and_cache(self, user_id: int, message_hash: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """Check rate limits and look up a cached response in at most one Redis round trip"""
+        if message_hash is None:
+            return await self.check_rate_limit(user_id), None
+        
+        cached = self._l1.get(message_hash)
+        if cached is not None:
+            return await self.check_rate_limit(user_id), cached
+        
+        if not (self.redis_distributed and self.redis_client):
+            if not self._local_rate_limit(user_id):
+                return False, None
+            return True, await self.get_cached_response(message_hash)
+        
+        try:
+            result = await self._eval_rate_limit(user_id, message_hash)
         except Exception as e:
-            logger.error(f"Rate limit check error: {e}")
-            return True
+            logger.error("Rate limit check error: %s", e)
+            if not self._local_rate_limit(user_id):
+                return False, None
+            return True, await self.get_cached_response(message_hash)
+        
+        if not result[0]:
+            return False, None
+        if len(result) < 3 or not result[2]:
+            return True, None
+        cached = self.decode_cached(result[2])
+        self._l1[message_hash] = cached
+        return True, cached
+    
+    async def _post_llm(self, url: str, payload: Dict[str, Any],
+                        headers: Optional[Dict[str, str]] = None) -> Tuple[int, Optional[bytes]]:
+        """POST to an LLM API, retrying rate limited and server errors"""
+        for attempt in range(LLM_ATTEMPTS):
+            async with self._llm_sem, self.http.post(url, json=payload, headers=headers) as response:
+                status = response.status
+                if status == 200:
+                    return status, await response.read()
+            if (status != 429 and status < 500) or attempt == LLM_ATTEMPTS - 1:
+                return status, None
+            # Backoff happens outside the semaphore; jitter spreads out retries
+            await asyncio.sleep(random.uniform(0.1, 0.5) * 2 ** attempt)
+        return status, None
     
     async def query_ollama(self, prompt: str, context: Optional[str] = None) -> Optional[str]:
         """Query Ollama API"""
@@ -132,22 +446,49 @@ class TaurosBot:
                 }
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.ollama_url}/api/generate",
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return result.get('response', '').strip()
-                    else:
-                        logger.error(f"Ollama API error: {response.status}")
-                        return None
+            status, body = await self._post_llm(f"{self.ollama_url}/api/generate", payload)
+            if body is not None:
+                result = orjson.loads(body)
+                return result.get('response', '').strip()
+            else:
+                logger.error("Ollama API error: %s", status)
+                return None
         except Exception as e:
-            logger.error(f"Ollama query error: {e}")
+            logger.error("Ollama query error: %s", e)
             return None
     
+    async def stream_ollama(self, prompt: str, context: Optional[str] = None) -> AsyncIterator[str]:
+        """Stream response tokens from Ollama as they are generated"""
+        payload = {
+            "model": self.ollama_model,
+            "prompt": f"{context}\n\n{prompt}" if context else prompt,
+            "stream": True,
+            "options": {
+                "temperature": 0.7,
+                "top_p": 0.9,
+                "max_tokens": 1000
+            }
+        }
+        
+        async with self._llm_sem, self.http.post(
+            f"{self.ollama_url}/api/generate",
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=2, sock_read=30)
+        ) as response:
+            if response.status != 200:
+                logger.error("Ollama API error: %s", response.status)
+                return
+            # Ollama streams one JSON object per line
+            async for line in response.content:
+                if not line.strip():
+                    continue
+                chunk = orjson.loads(line)
+                token = chunk.get('response', '')
+                if token:
+                    yield token
+                if chunk.get('done'):
+                    break
+    
     async def query_openai(self, prompt: str, context: Optional[str] = None) -> Optional[str]:
         """Query OpenAI API as fallback"""
         if not self.openai_key:
@@ -171,122 +512,166 @@ class TaurosBot:
                 "Content-Type": "application/json"
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    json=payload,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return result['choices'][0]['message']['content'].strip()
-                    else:
-                        logger.error(f"OpenAI API error: {response.status}")
-                        return None
+            status, body = await self._post_llm(
+                "https://api.openai.com/v1/chat/completions",
+                payload,
+                headers=headers
+            )
+            if body is not None:
+                result = orjson.loads(body)
+                return result['choices'][0]['message']['content'].strip()
+            else:
+                logger.error("OpenAI API error: %s", status)
+                return None
         except Exception as e:
-            logger.error(f"OpenAI query error: {e}")
+            logger.error("OpenAI query error: %s", e)
             return None
     
-    async def generate_response(self, prompt: str, user_context: Optional[str] = None) -> str:
-        """Generate AI response with fallback mechanism"""
-        # Create context from personality
-        context = f"You are {self.personality['name']}, {self.personality['description']}. " \
-                 f"Your response style is {self.personality['response_style']}."
+    async def generate_response(self, prompt: str, user_context: Optional[str] = None,
+                                use_ollama: bool = True) -> Optional[str]:
+        """Generate AI response with fallback mechanism
+        
+        use_ollama=False goes straight to the OpenAI fallback, for callers
+        that already know Ollama just failed. Returns None if no backend
+        produced a response.
+        """
+        self.reload_personality()
         
-        if user_context:
-            context += f"\n\nUser context: {user_context}"
+        # Context from the precomputed personality prompt
+        context = self._sys_prompt if not user_context else f"{self._sys_prompt}\n\nUser context: {user_context}"
         
         # Try Ollama first
-        response = await self.query_ollama(prompt, context)
+        response = await self.query_ollama(prompt, context) if use_ollama else None
         
         # Fallback to OpenAI if enabled and Ollama fails
         if not response and self.use_openai_if_fail:
             logger.info("Ollama failed, trying OpenAI...")
             response = await self.query_openai(prompt, context)
         
-        return response if response else "I'm sorry, I'm having trouble generating a response right now. Please try again later."
+        return response or None
     
-    async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /start command"""
-        user = update.effective_user
-        welcome_message = f"""
-🤖 **Welcome to {self.personality['name']}!**
-
-Hello {user.first_name}! I'm an AI assistant powered by Ollama/OpenAI.
-
-**Available Commands:**
-• `/help` - Show this help message
-• `/status` - Check bot status
-• `/clear` - Clear conversation history
-• `/settings` - Bot settings
-
-Just send me a message and I'll respond with AI-generated content!
+    async def stream_response(self, prompt: str, message: Message) -> Optional[str]:
+        """Stream an Ollama response into a reply, editing it as tokens arrive
+        
+        Returns the complete response, an empty string if the stream broke after
+        a partial reply was sent, or None if nothing was sent.
         """
+        self.reload_personality()
         
-        keyboard = [
-            [InlineKeyboardButton("🆘 Help", callback_data='help')],
-            [InlineKeyboardButton("⚙️ Settings", callback_data='settings')],
-            [InlineKeyboardButton("📊 Status", callback_data='status')]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        parts: List[str] = []
+        updated = asyncio.Event()
+        
+        async def read_stream():
+            async for token in self.stream_ollama(prompt, self._sys_prompt):
+                parts.append(token)
+                updated.set()
+        
+        # Tokens are read in their own task so the LLM slot is released as soon
+        # as generation ends, however long the Telegram calls below take
+        reader = asyncio.create_task(read_stream())
+        sent: Optional[Message] = None
+        shown = ""
+        try:
+            while not reader.done():
+                waiter = asyncio.create_task(updated.wait())
+                await asyncio.wait({reader, waiter}, return_when=asyncio.FIRST_COMPLETED)
+                waiter.cancel()
+                if reader.done():
+                    break
+                updated.clear()
+                
+                text = "".join(parts)
+                if text.strip() and text != shown:
+                    try:
+                        if sent is None:
+                            sent = await message.reply_text(text)
+                        else:
+                            await sent.edit_text(text)
+                        shown = text
+                    except TelegramError as e:
+                        # Flood control or a network blip: skip this edit, the
+                        # next one (or the final render) catches up
+                        logger.warning("Stream edit skipped: %s", e)
+                
+                # Debounce edits while generation continues
+                await asyncio.wait({reader}, timeout=STREAM_EDIT_INTERVAL)
+        finally:
+            if not reader.done():
+                reader.cancel()
+        
+        accumulator = "".join(parts)
+        error = reader.exception()
+        if error is not None:
+            logger.error("Ollama stream error: %s", error)
+            if sent is not None:
+                try:
+                    await sent.edit_text(f"{accumulator}\n\n⚠️ Response interrupted.")
+                except TelegramError as e:
+                    logger.warning("Stream edit skipped: %s", e)
+                return ""
+            return None
         
+        response = accumulator.strip()
+        if not response:
+            return None
+        
+        # Final render with Markdown now that the text is complete, in plain
+        # text if the model's Markdown doesn't parse
+        try:
+            if sent is None:
+                await message.reply_text(response, parse_mode=ParseMode.MARKDOWN)
+            else:
+                await sent.edit_text(response, parse_mode=ParseMode.MARKDOWN)
+        except BadRequest as e:
+            if "not modified" in str(e).lower():
+                return response
+            logger.warning("Markdown render failed, sending plain text: %s", e)
+            if sent is None:
+                await message.reply_text(response)
+            elif response != shown.strip():
+                # Telegram rejects an edit that leaves the text unchanged
+                await sent.edit_text(response)
+        return response
+    
+    async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /start command"""
+        user = update.effective_user
         await update.message.reply_text(
-            welcome_message,
+            self._welcome_tmpl.format(first_name=user.first_name),
             parse_mode=ParseMode.MARKDOWN,
-            reply_markup=reply_markup
+            reply_markup=self._start_markup
         )
     
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /help command"""
-        help_text = f"""
-🆘 **{self.personality['name']} Help**
-
-**Commands:**
-• `/start` - Start the bot and show welcome message
-• `/help` - Show this help message
-• `/status` - Check bot and services status
-• `/clear` - Clear your conversation history
-• `/settings` - Configure bot settings
-
-**Features:**
-• AI-powered responses using Ollama/OpenAI
-• Conversation memory and context
-• Rate limiting for fair usage
-• Cached responses for faster replies
-
-**Usage:**
-Simply send me any message and I'll respond with AI-generated content. I can help with:
-• Questions and answers
-• Creative writing
-• Problem solving
-• General conversation
-
-**Rate Limits:**
-You can send up to {self.rate_limit_max_requests} messages per {self.rate_limit_window} seconds.
-        """
-        
-        await update.message.reply_text(help_text, parse_mode=ParseMode.MARKDOWN)
+        await update.message.reply_text(self._help_text, parse_mode=ParseMode.MARKDOWN)
+    
+    async def _probe_ollama(self) -> str:
+        """Check Ollama status"""
+        try:
+            async with self.http.get(f"{self.ollama_url}/api/tags", timeout=aiohttp.ClientTimeout(total=5)) as response:
+                return "🟢 Online" if response.status == 200 else "🔴 Offline"
+        except Exception:
+            return "🔴 Offline"
+    
+    async def _probe_redis(self) -> str:
+        """Check Redis status"""
+        if not self.redis_client:
+            return "🔴 Offline"
+        try:
+            await self.redis_client.ping()
+            return "🟢 Online"
+        except Exception:
+            return "🔴 Offline"
     
     async def status_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /status command"""
-        # Check Ollama status
-        ollama_status = "🟢 Online"
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.ollama_url}/api/tags", timeout=aiohttp.ClientTimeout(total=5)) as response:
-                    if response.status != 200:
-                        ollama_status = "🔴 Offline"
-        except:
-            ollama_status = "🔴 Offline"
-        
-        # Check Redis status
-        redis_status = "🟢 Online" if self.redis_client else "🔴 Offline"
-        if self.redis_client:
-            try:
-                await self.redis_client.ping()
-            except:
-                redis_status = "🔴 Offline"
+        if self._status_cache and time.monotonic() - self._status_cache[0] < STATUS_CACHE_TTL:
+            await update.message.reply_text(self._status_cache[1], parse_mode=ParseMode.MARKDOWN)
+            return
+        
+        # Probe Ollama and Redis concurrently
+        ollama_status, redis_status = await asyncio.gather(self._probe_ollama(), self._probe_redis())
         
         # Check OpenAI status
         openai_status = "🟢 Available" if self.openai_key else "🔴 Not configured"
@@ -307,6 +692,7 @@ You can send up to {self.rate_limit_max_requests} messages per {self.rate_limit_
 **Model:** {self.ollama_model}
 **Cache:** {'Enabled' if self.redis_client else 'Disabled'}
         """
+        self._status_cache = (time.monotonic(), status_text)
         
         await update.message.reply_text(status_text, parse_mode=ParseMode.MARKDOWN)
     
@@ -315,56 +701,76 @@ You can send up to {self.rate_limit_max_requests} messages per {self.rate_limit_
         user_id = update.effective_user.id
         if self.redis_client:
             try:
-                # Clear user's conversation cache
-                keys = await self.redis_client.keys(f"context:{user_id}:*")
-                if keys:
-                    await self.redis_client.delete(*keys)
+                # Clear user's conversation cache; SCAN + UNLINK in batches so
+                # Redis is never blocked walking the whole keyspace
+                batch = []
+                async for key in self.redis_client.scan_iter(match=f"context:{user_id}:*", count=500):
+                    batch.append(key)
+                    if len(batch) >= 500:
+                        await self.redis_client.unlink(*batch)
+                        batch.clear()
+                if batch:
+                    await self.redis_client.unlink(*batch)
                 await update.message.reply_text("✅ Your conversation history has been cleared!")
             except Exception as e:
-                logger.error(f"Clear command error: {e}")
+                logger.error("Clear command error: %s", e)
                 await update.message.reply_text("❌ Error clearing history. Please try again.")
         else:
             await update.message.reply_text("✅ Conversation history cleared (cache not available)!")
     
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle regular messages"""
+        """Handle regular messages
+        
+        Per-message cost is network-bound: one Redis round trip for the rate
+        limit and cache lookup, one LLM request over the shared session on a
+        miss, and the Telegram reply. Anything else that waits on the network
+        (typing indicator, cache write) is kept off the reply path.
+        """
         user = update.effective_user
         message_text = update.message.text
         
-        # Check rate limiting
-        if not await self.check_rate_limit(user.id):
+        message_hash = self.cache_key(message_text)
+        
+        # Check rate limiting and the response cache in one round trip
+        allowed, cached_response = await self.check_rate_limit_and_cache(user.id, message_hash)
+        if not allowed:
             await update.message.reply_text(
                 f"⏰ Rate limit exceeded. Please wait before sending another message.\n"
                 f"Limit: {self.rate_limit_max_requests} messages per {self.rate_limit_window} seconds."
             )
             return
         
-        # Show typing indicator
-        await context.bot.send_chat_action(chat_id=update.effective_chat.id, action='typing')
-        
-        # Check for cached response
-        message_hash = f"{user.id}:{hash(message_text)}"
-        cached_response = await self.get_cached_response(message_hash)
-        
         if cached_response:
             await update.message.reply_text(f"💾 {cached_response}")
             return
         
+        # Show typing indicator without waiting for Telegram to acknowledge it
+        self.spawn(context.bot.send_chat_action(chat_id=update.effective_chat.id, action='typing'))
+        
         try:
-            # Generate AI response
-            response = await self.generate_response(message_text)
-            
-            # Cache the response
-            await self.cache_response(message_hash, response)
+            # Stream the AI response into the reply as it is generated
+            response = await self.stream_response(message_text, update.message)
+            if response is None:
+                # Ollama produced nothing; asking it again would only spend
+                # more round trips before the OpenAI fallback
+                response = await self.generate_response(message_text, use_ollama=False)
+                if response is None:
+                    await update.message.reply_text(
+                        "I'm sorry, I'm having trouble generating a response right now. Please try again later."
+                    )
+                    return
+                await update.message.reply_text(response, parse_mode=ParseMode.MARKDOWN)
             
-            # Send response
-            await update.message.reply_text(response, parse_mode=ParseMode.MARKDOWN)
+            # Cache only complete model output; the reply is already out
+            if response and message_hash:
+                self.spawn(self.cache_response(message_hash, response))
             
-            # Log interaction
-            logger.info(f"User {user.id} ({user.username}): {message_text[:50]}... -> Response: {len(response)} chars")
+            # Log interaction (file and stream writes happen on the listener thread)
+            logger.info("User %s (%s): %s... -> Response: %d chars",
+                        user.id, user.username, message_text[:50], len(response))
             
         except Exception as e:
-            logger.error(f"Message handling error: {e}")
+            logger.error("Message handling error: %s", e)
             await update.message.reply_text(
                 "❌ Sorry, I encountered an error processing your message. Please try again."
             )
@@ -393,16 +799,25 @@ Contact admin to modify settings.
     
     async def error_handler(self, update: object, context: ContextTypes.DEFAULT_TYPE):
         """Handle errors"""
-        logger.error(f"Exception while handling an update: {context.error}")
+        logger.error("Exception while handling an update: %s", context.error)
     
     def run(self):
         """Run the bot"""
+        # libuv-based loop for PTB's polling and all the network I/O it drives
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        
         if not self.token:
             logger.error("TELEGRAM_TOKEN not found in environment variables")
             return
         
         # Create application
-        application = Application.builder().token(self.token).build()
+        application = (
+            Application.builder()
+            .token(self.token)
+            .post_init(self._post_init)
+            .post_shutdown(self._post_shutdown)
+            .build()
+        )
         
         # Add handlers
         application.add_handler(CommandHandler("start", self.start_command))
@@ -413,12 +828,13 @@ Contact admin to modify settings.
         application.add_handler(CallbackQueryHandler(self.button_callback))
         application.add_error_handler(self.error_handler)
         
-        # Setup Redis
-        asyncio.get_event_loop().run_until_complete(self.setup_redis())
-        
-        logger.info(f"Starting {self.personality['name']} bot...")
+        logger.info("Starting %s bot...", self.personality['name'])
         application.run_polling(allowed_updates=Update.ALL_TYPES)
 
 if __name__ == "__main__":
-    bot = TaurosBot()
-    bot.run()
\ No newline at end of file
+    log_listener.start()
+    try:
+        bot = TaurosBot()
+        bot.run()
+    finally:
+        log_listener.stop()
\ No newline at end of file